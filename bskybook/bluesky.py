@@ -1,12 +1,15 @@
 """BlueSky API client for fetching posts."""
 
 import logging
+import time
 from typing import Any, Optional
 from dataclasses import dataclass
 
+import orjson
 import requests
+from urllib3.util.retry import Retry
 
-from bskybook.utils import extract_links
+from bskybook.utils import create_session, extract_links
 
 logger = logging.getLogger(__name__)
 
@@ -21,22 +24,64 @@ class Post:
     author: str
 
 
+class _RateLimitRetry(Retry):
+    """Retry policy that waits at most MAX_RATE_LIMIT_WAIT for Retry-After."""
+
+    def parse_retry_after(self, retry_after: str) -> float:
+        seconds = super().parse_retry_after(retry_after)
+        return min(seconds, BlueSkyClient.MAX_RATE_LIMIT_WAIT)
+
+
 class BlueSkyClient:
     """Client for interacting with the BlueSky public API."""
 
     API_BASE = "https://public.api.bsky.app/xrpc"
 
-    def __init__(self, timeout: int = 30):
+    USER_AGENT = "bskybook/0.1.0"
+
+    # The public API is rate limited: retry transient failures with a longer
+    # backoff than other hosts and honor the server's Retry-After header, up
+    # to MAX_RATE_LIMIT_WAIT seconds
+    RETRY = _RateLimitRetry(
+        total=5,
+        backoff_factor=1.0,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True
+    )
+
+    # Pause before the next request once this few requests are left in the
+    # current rate limit window, for at most MAX_RATE_LIMIT_WAIT seconds
+    RATE_LIMIT_THRESHOLD = 1
+    MAX_RATE_LIMIT_WAIT = 60
+
+    def __init__(
+        self,
+        timeout: int = 30,
+        use_cache: bool = False,
+        session: Optional[requests.Session] = None
+    ):
         """Initialize the BlueSky client.
 
         Args:
             timeout: Request timeout in seconds
+            use_cache: Whether to cache API responses on disk (ignored when
+                a session is given)
+            session: Shared HTTP session to use instead of creating one.
+                It is left open by close(). Create it with
+                prefix_retries={f"{API_BASE}/": RETRY} to keep the API's
+                retry policy.
         """
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'bskybook/0.1.0'
-        })
+        self._owns_session = session is None
+        if session is None:
+            session = create_session(
+                self.USER_AGENT,
+                use_cache=use_cache,
+                retry=self.RETRY
+            )
+        self.session = session
+        self._rate_limit_reset: Optional[float] = None
 
     def get_author_feed(self, handle: str, limit: int = 20) -> list[Post]:
         """Fetch posts from an author's feed.
@@ -60,9 +105,16 @@ class BlueSkyClient:
         }
 
         try:
-            response = self.session.get(url, params=params, timeout=self.timeout)
+            self._wait_for_rate_limit()
+            response = self.session.get(
+                url,
+                params=params,
+                headers={"User-Agent": self.USER_AGENT},
+                timeout=self.timeout
+            )
+            self._update_rate_limit(response)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
 
             posts = []
             feed_items = data.get("feed", [])
@@ -70,21 +122,28 @@ class BlueSkyClient:
             logger.info(f"Retrieved {len(feed_items)} posts from API")
 
             for item in feed_items:
-                post_data = item.get("post", {})
-                record = post_data.get("record", {})
+                post_data = item.get("post") or {}
+                record = post_data.get("record") or {}
+                record_get = record.get
 
                 # Extract text content
-                text = record.get("text", "")
+                text = record_get("text", "")
 
-                # Extract links from text
-                links = extract_links(text)
+                # Extract links (dict keys drop repeated links while
+                # preserving order). Clients shorten long links in the post
+                # text, so the link facets are used when present as they
+                # hold the full URLs; otherwise the text is scanned.
+                links = dict.fromkeys(self._facet_links(record_get("facets")))
+                if not links:
+                    links = dict.fromkeys(extract_links(text))
 
                 # Also check for embedded links
-                embed = record.get("embed", {})
-                if embed and "external" in embed:
-                    external_uri = embed["external"].get("uri")
-                    if external_uri and external_uri not in links:
-                        links.append(external_uri)
+                embed = record_get("embed") or {}
+                external = embed.get("external")
+                if external:
+                    external_uri = external.get("uri")
+                    if external_uri:
+                        links.setdefault(external_uri)
 
                 # Skip posts without links
                 if not links:
@@ -94,8 +153,8 @@ class BlueSkyClient:
                 post = Post(
                     uri=post_data.get("uri", ""),
                     text=text,
-                    links=links,
-                    created_at=record.get("createdAt", ""),
+                    links=list(links),
+                    created_at=record_get("createdAt", ""),
                     author=handle
                 )
                 posts.append(post)
@@ -103,13 +162,63 @@ class BlueSkyClient:
             logger.info(f"Found {len(posts)} posts with links")
             return posts
 
-        except requests.RequestException as e:
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
             logger.error(f"Failed to fetch posts from @{handle}: {e}")
             raise
 
+    @staticmethod
+    def _facet_links(facets: Optional[list[dict[str, Any]]]) -> list[str]:
+        """Get the link targets from a post's rich text facets.
+
+        Args:
+            facets: The record's "facets" list, if any
+
+        Returns:
+            URIs of the link facets, in order
+        """
+        return [
+            feature["uri"]
+            for facet in facets or ()
+            for feature in facet.get("features") or ()
+            if feature.get("$type") == "app.bsky.richtext.facet#link" and feature.get("uri")
+        ]
+
+    def _update_rate_limit(self, response: requests.Response) -> None:
+        """Record when to pause based on the API's rate limit headers.
+
+        Args:
+            response: Response from the API
+        """
+        # Headers of cached responses describe an old rate limit window
+        if getattr(response, 'from_cache', False):
+            return
+
+        remaining = response.headers.get('ratelimit-remaining')
+        reset = response.headers.get('ratelimit-reset')
+        if remaining is None or reset is None:
+            return
+
+        try:
+            if int(remaining) <= self.RATE_LIMIT_THRESHOLD:
+                self._rate_limit_reset = float(reset)
+        except ValueError:
+            logger.debug(f"Ignoring invalid rate limit headers: {remaining}, {reset}")
+
+    def _wait_for_rate_limit(self) -> None:
+        """Sleep until the rate limit window resets if it is nearly used up."""
+        if self._rate_limit_reset is None:
+            return
+
+        delay = min(self._rate_limit_reset - time.time(), self.MAX_RATE_LIMIT_WAIT)
+        self._rate_limit_reset = None
+        if delay > 0:
+            logger.warning(f"BlueSky rate limit nearly reached, waiting {delay:.0f}s")
+            time.sleep(delay)
+
     def close(self) -> None:
-        """Close the HTTP session."""
-        self.session.close()
+        """Close the HTTP session unless it was passed in."""
+        if self._owns_session:
+            self.session.close()
 
     def __enter__(self):
         """Context manager entry."""
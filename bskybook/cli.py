@@ -10,7 +10,12 @@ from bskybook.bluesky import BlueSkyClient
 from bskybook.content import ContentExtractor
 from bskybook.cover import CoverGenerator
 from bskybook.epub import EPUBGenerator
-from bskybook.utils import extract_handle_from_url, setup_logging, sanitize_filename
+from bskybook.utils import (
+    create_session,
+    extract_handle_from_url,
+    setup_logging,
+    sanitize_filename,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -28,12 +33,29 @@ logger = logging.getLogger(__name__)
     type=click.Path(path_type=Path),
     help='Output EPUB file path (default: <handle>.epub)'
 )
+@click.option(
+    '--no-cache',
+    is_flag=True,
+    help='Do not read or write the on-disk HTTP cache'
+)
+@click.option(
+    '--strict-metadata',
+    is_flag=True,
+    help='Use slower but more thorough article metadata extraction'
+)
 @click.option(
     '--verbose', '-v',
     is_flag=True,
     help='Enable verbose output'
 )
-def main(profile: str, count: int, output: Optional[Path], verbose: bool) -> None:
+def main(
+    profile: str,
+    count: int,
+    output: Optional[Path],
+    no_cache: bool,
+    strict_metadata: bool,
+    verbose: bool
+) -> None:
     """Create an EPUB ebook from a BlueSky feed.
 
     PROFILE can be either a BlueSky handle (e.g., 'republik.ch') or
@@ -59,10 +81,18 @@ def main(profile: str, count: int, output: Optional[Path], verbose: bool) -> Non
         safe_handle = sanitize_filename(handle)
         output = Path(f"{safe_handle}.epub")
 
+    # One session for every download so connections are reused across steps,
+    # keeping the BlueSky API's own retry policy for its requests
+    session = create_session(
+        BlueSkyClient.USER_AGENT,
+        use_cache=not no_cache,
+        prefix_retries={f"{BlueSkyClient.API_BASE}/": BlueSkyClient.RETRY}
+    )
+
     try:
         # Step 1: Fetch posts from BlueSky
         click.echo(f"Fetching {count} posts from @{handle}...")
-        with BlueSkyClient() as client:
+        with BlueSkyClient(session=session) as client:
             posts = client.get_author_feed(handle, limit=count)
 
         if not posts:
@@ -71,27 +101,27 @@ def main(profile: str, count: int, output: Optional[Path], verbose: bool) -> Non
 
         click.echo(f"Found {len(posts)} posts with links")
 
-        # Step 2: Extract all unique links
-        all_links = []
+        # Step 2: Extract all unique links (dict keys preserve order)
+        unique_links: dict[str, None] = {}
         for post in posts:
-            all_links.extend(post.links)
-
-        # Remove duplicates while preserving order
-        unique_links = list(dict.fromkeys(all_links))
+            for link in post.links:
+                unique_links.setdefault(link)
         click.echo(f"Extracting content from {len(unique_links)} unique links...")
 
         # Step 3: Extract article content
         with click.progressbar(
-            unique_links,
+            length=len(unique_links),
             label='Extracting articles',
             show_pos=True
-        ) as links:
-            with ContentExtractor() as extractor:
-                articles = []
-                for link in links:
-                    article = extractor.extract_article(link)
-                    if article:
-                        articles.append(article)
+        ) as bar:
+            with ContentExtractor(
+                strict_metadata=strict_metadata,
+                session=session
+            ) as extractor:
+                articles = extractor.extract_multiple(
+                    list(unique_links),
+                    on_progress=bar.update
+                )
 
         if not articles:
             click.echo("No articles could be extracted.", err=True)
@@ -101,7 +131,7 @@ def main(profile: str, count: int, output: Optional[Path], verbose: bool) -> Non
 
         # Step 4: Generate cover
         click.echo("Generating cover image...")
-        with CoverGenerator() as cover_gen:
+        with CoverGenerator(session=session) as cover_gen:
             cover_data = cover_gen.generate_cover(
                 articles,
                 title=f"{handle}"
@@ -129,6 +159,8 @@ def main(profile: str, count: int, output: Optional[Path], verbose: bool) -> Non
         logger.exception("An error occurred")
         click.echo(f"Error: {e}", err=True)
         raise SystemExit(1)
+    finally:
+        session.close()
 
 
 if __name__ == '__main__':
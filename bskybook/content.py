@@ -1,15 +1,41 @@
 """Content extraction and processing using trafilatura."""
 
 import logging
+import multiprocessing
+import re
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
 from dataclasses import dataclass
-from typing import Optional
+from html import unescape
+from typing import Callable, Optional
 
+import lxml.html
 import requests
 import trafilatura
-from bs4 import BeautifulSoup
+from trafilatura.htmlprocessing import build_html_output
+from trafilatura.xml import xmltotxt
+
+from bskybook.utils import create_session, read_body
 
 logger = logging.getLogger(__name__)
 
+# Metadata and thumbnail meta tags are read from the page head without
+# building a DOM
+_META_TAG_RE = re.compile(rb'<meta\s[^>]*>', re.IGNORECASE)
+_META_ATTR_RE = re.compile(rb'([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+_TITLE_RE = re.compile(rb'<title[^>]*>([^<]{1,400})</title>', re.IGNORECASE)
+_ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+_THUMBNAIL_XPATH = (
+    '(//meta[@property="og:image"]/@content'
+    '|//meta[@name="twitter:image"]/@content'
+    '|//img/@src)[1]'
+)
+
 
 @dataclass
 class Article:
@@ -23,20 +49,239 @@ class Article:
     thumbnail_url: Optional[str] = None
 
 
+def parse_html(html: bytes, url: str, strict_metadata: bool = False) -> Optional[Article]:
+    """Extract article content from already downloaded HTML.
+
+    This is a module-level function so it can be run in worker processes.
+
+    Title, author and date are taken from the page's <head> when all three
+    are there; trafilatura's much slower metadata extraction only runs
+    otherwise, or when strict_metadata is set.
+
+    Args:
+        html: The raw page HTML (trafilatura detects the encoding)
+        url: The URL the HTML was fetched from
+        strict_metadata: Always use trafilatura's metadata extraction
+
+    Returns:
+        Article object if successful, None otherwise
+    """
+    try:
+        head = _get_head(html)
+        meta = _read_head_meta(head)
+        head_title = meta.get('og:title') or _read_title(head)
+        head_author = meta.get('author')
+        date_match = _ISO_DATE_RE.match(meta.get('article:published_time', ''))
+        head_date = date_match.group() if date_match else None
+        use_head_metadata = (
+            bool(head_title and head_author and head_date) and not strict_metadata
+        )
+
+        # Parse the page once and derive every output from the same document
+        document = trafilatura.bare_extraction(
+            html,
+            url=url,
+            with_metadata=not use_head_metadata,
+            include_comments=False,
+            include_tables=True,
+            include_images=True
+        )
+
+        if document is None or document.body is None:
+            logger.warning(f"No content extracted from {url}")
+            return None
+
+        # Markdown conversion works on a copy of the body, so it must run
+        # before the HTML conversion, which rewrites the body in place.
+        # Formatting is left out of the shared tree: it would carry tags
+        # such as <u> into the HTML that XHTML 1.1 does not allow
+        markdown = xmltotxt(document.body, include_formatting=False)
+
+        if not markdown:
+            logger.warning(f"No content extracted from {url}")
+            return None
+
+        # Get HTML version (we'll convert to XHTML later)
+        html_content = build_html_output(document)
+
+        if not html_content:
+            html_content = f"<p>{markdown.replace('\n\n', '</p><p>')}</p>"
+
+        if use_head_metadata:
+            title = head_title
+            author = head_author
+            date = head_date
+        else:
+            title = document.title or 'Untitled'
+            author = document.author
+            date = document.date
+
+        # Extract og:image for cover
+        thumbnail = _extract_thumbnail(html, meta)
+
+        article = Article(
+            url=url,
+            title=title,
+            content_markdown=markdown,
+            content_html=html_content,
+            author=author,
+            date=date,
+            thumbnail_url=thumbnail
+        )
+
+        logger.info(f"Successfully extracted: {article.title}")
+        return article
+
+    except Exception as e:
+        logger.error(f"Failed to extract content from {url}: {e}")
+        return None
+
+
+def _get_head(html: bytes) -> bytes:
+    """Return the part of the HTML before </head> (or all of it).
+
+    Args:
+        html: The raw HTML content
+
+    Returns:
+        The head section of the HTML
+    """
+    head_end = html.find(b'</head>')
+    return html[:head_end] if head_end != -1 else html
+
+
+def _read_head_meta(head: bytes) -> dict[str, str]:
+    """Collect <meta> tags from the page head.
+
+    Tags are keyed by their property or name attribute; the first occurrence
+    wins. Values that are not valid UTF-8 are skipped.
+
+    Args:
+        head: The head section of the HTML
+
+    Returns:
+        Mapping of meta property/name to unescaped content
+    """
+    meta: dict[str, str] = {}
+    for tag in _META_TAG_RE.finditer(head):
+        attrs = {
+            name.lower(): double or single
+            for name, double, single in _META_ATTR_RE.findall(tag.group())
+        }
+        key = attrs.get(b'property') or attrs.get(b'name')
+        content = attrs.get(b'content')
+        if not key or not content:
+            continue
+        try:
+            meta.setdefault(key.decode('utf-8'), unescape(content.decode('utf-8')).strip())
+        except UnicodeDecodeError:
+            continue
+    return meta
+
+
+def _read_title(head: bytes) -> Optional[str]:
+    """Read the <title> of a page.
+
+    Args:
+        head: The head section of the HTML
+
+    Returns:
+        The unescaped title, or None if missing or not valid UTF-8
+    """
+    match = _TITLE_RE.search(head)
+    if not match:
+        return None
+    try:
+        return unescape(match.group(1).decode('utf-8')).strip() or None
+    except UnicodeDecodeError:
+        return None
+
+
+def _extract_thumbnail(html: bytes, meta: dict[str, str]) -> Optional[str]:
+    """Extract og:image or other thumbnail URLs from HTML.
+
+    The meta tags of the page head are checked first; the page is only
+    parsed with lxml if none of them is present.
+
+    Args:
+        html: The raw HTML content
+        meta: Meta tags of the page head, as returned by _read_head_meta
+
+    Returns:
+        Thumbnail URL if found, None otherwise
+    """
+    # Prefer og:image, then twitter:image
+    thumbnail = meta.get('og:image') or meta.get('twitter:image')
+    if thumbnail:
+        return thumbnail
+
+    try:
+        # Fall back to parsing the page (e.g. for the first image in content)
+        matches = lxml.html.fromstring(html).xpath(_THUMBNAIL_XPATH)
+        return str(matches[0]) if matches else None
+
+    except Exception as e:
+        logger.debug(f"Failed to extract thumbnail: {e}")
+        return None
+
+
+def _parse_context() -> multiprocessing.context.BaseContext:
+    """Return the multiprocessing context for the parse worker processes.
+
+    Workers are started while the download threads are running, and fork()
+    is not safe in a multi-threaded process. The forkserver preloads this
+    module once and forks workers from its own single-threaded process; spawn
+    is used where forkserver is not available (Windows).
+
+    Returns:
+        A forkserver or spawn context
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context('spawn')
+
+
 class ContentExtractor:
     """Extracts and processes content from URLs."""
 
-    def __init__(self, timeout: int = 30):
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+    # Pages are truncated beyond this size to bound memory use
+    MAX_PAGE_SIZE = 8 * 1024 * 1024
+
+    def __init__(
+        self,
+        timeout: int = 30,
+        max_workers: int = 16,
+        parse_workers: Optional[int] = None,
+        use_cache: bool = False,
+        strict_metadata: bool = False,
+        session: Optional[requests.Session] = None
+    ):
         """Initialize the content extractor.
 
         Args:
             timeout: Request timeout in seconds
+            max_workers: Maximum number of pages downloaded concurrently
+            parse_workers: Number of processes used to parse pages
+                (default: number of CPUs)
+            use_cache: Whether to cache downloaded pages on disk (ignored
+                when a session is given)
+            strict_metadata: Always run trafilatura's metadata extraction
+                instead of reading title, author and date from the page head
+            session: Shared HTTP session to use instead of creating one.
+                It is left open by close().
         """
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self.max_workers = max_workers
+        self.parse_workers = parse_workers
+        self.strict_metadata = strict_metadata
+        self._owns_session = session is None
+        if session is None:
+            session = create_session(self.USER_AGENT, use_cache=use_cache)
+        self.session = session
 
     def extract_article(self, url: str) -> Optional[Article]:
         """Extract article content from a URL.
@@ -47,146 +292,98 @@ class ContentExtractor:
         Returns:
             Article object if successful, None otherwise
         """
-        logger.info(f"Extracting content from: {url}")
-
-        try:
-            # Fetch the page
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            html = response.text
-
-            # Extract main content using trafilatura
-            # Use simple extract first
-            markdown = trafilatura.extract(
-                html,
-                url=url,
-                include_comments=False,
-                include_tables=True,
-                include_images=True,
-                output_format='markdown'
-            )
-
-            if not markdown:
-                logger.warning(f"No content extracted from {url}")
-                return None
-
-            # Get HTML version (we'll convert to XHTML later)
-            html_content = trafilatura.extract(
-                html,
-                url=url,
-                include_comments=False,
-                include_tables=True,
-                include_images=True,
-                output_format='html'
-            )
-
-            if not html_content:
-                html_content = f"<p>{markdown.replace('\n\n', '</p><p>')}</p>"
-
-            # Extract metadata
-            metadata = trafilatura.bare_extraction(
-                html,
-                url=url,
-                with_metadata=True,
-                include_comments=False,
-                include_tables=False,
-                include_images=False
-            )
-
-            # Get title and other metadata
-            title = 'Untitled'
-            author = None
-            date = None
-
-            if metadata:
-                # Handle both dict and object responses
-                if isinstance(metadata, dict):
-                    title = metadata.get('title', 'Untitled')
-                    author = metadata.get('author')
-                    date = metadata.get('date')
-                else:
-                    # It's a Document object
-                    title = getattr(metadata, 'title', 'Untitled') or 'Untitled'
-                    author = getattr(metadata, 'author', None)
-                    date = getattr(metadata, 'date', None)
-
-            # Extract og:image for cover
-            thumbnail = self._extract_thumbnail(html)
-
-            article = Article(
-                url=url,
-                title=title,
-                content_markdown=markdown,
-                content_html=html_content,
-                author=author,
-                date=date,
-                thumbnail_url=thumbnail
-            )
-
-            logger.info(f"Successfully extracted: {article.title}")
-            return article
-
-        except requests.RequestException as e:
-            logger.error(f"Failed to fetch {url}: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Failed to extract content from {url}: {e}")
+        html = self.fetch_html(url)
+        if html is None:
             return None
+        return parse_html(html, url, self.strict_metadata)
 
-    def _extract_thumbnail(self, html: str) -> Optional[str]:
-        """Extract og:image or other thumbnail URLs from HTML.
+    def fetch_html(self, url: str) -> Optional[bytes]:
+        """Download the raw HTML of a page.
+
+        The body is streamed and truncated after MAX_PAGE_SIZE bytes.
 
         Args:
-            html: The HTML content
+            url: The URL to fetch
 
         Returns:
-            Thumbnail URL if found, None otherwise
+            The undecoded page HTML if successful, None otherwise
         """
-        try:
-            soup = BeautifulSoup(html, 'html.parser')
-
-            # Try og:image first
-            og_image = soup.find('meta', property='og:image')
-            if og_image and og_image.get('content'):
-                return og_image['content']
-
-            # Try twitter:image
-            twitter_image = soup.find('meta', attrs={'name': 'twitter:image'})
-            if twitter_image and twitter_image.get('content'):
-                return twitter_image['content']
-
-            # Try finding first image in content
-            img = soup.find('img')
-            if img and img.get('src'):
-                return img['src']
+        logger.info(f"Extracting content from: {url}")
 
-            return None
+        try:
+            with self.session.get(
+                url,
+                headers={'User-Agent': self.USER_AGENT},
+                timeout=self.timeout,
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                html, truncated = read_body(response, self.MAX_PAGE_SIZE, self.session)
+
+            if truncated:
+                logger.warning(f"Truncating {url} at {self.MAX_PAGE_SIZE} bytes")
+            return html
 
         except Exception as e:
-            logger.debug(f"Failed to extract thumbnail: {e}")
+            logger.error(f"Failed to fetch {url}: {e}")
             return None
 
-    def extract_multiple(self, urls: list[str]) -> list[Article]:
+    def extract_multiple(
+        self,
+        urls: list[str],
+        on_progress: Optional[Callable[[int], None]] = None
+    ) -> list[Article]:
         """Extract content from multiple URLs.
 
+        Pages are downloaded concurrently by a thread pool and handed to a
+        process pool for parsing as soon as each one arrives, whatever the
+        order of the URLs, since trafilatura is CPU-bound. Articles are
+        returned in the order of the URLs.
+
         Args:
             urls: List of URLs to extract
+            on_progress: Optional callback invoked with 1 after each URL is processed
 
         Returns:
             List of successfully extracted Article objects
         """
-        articles = []
-        for url in urls:
-            article = self.extract_article(url)
-            if article:
-                articles.append(article)
-
+        results: list[Optional[Article]] = [None] * len(urls)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as fetcher, \
+                ProcessPoolExecutor(
+                    max_workers=self.parse_workers,
+                    mp_context=_parse_context()
+                ) as parser:
+            fetches = {fetcher.submit(self.fetch_html, url): idx for idx, url in enumerate(urls)}
+            parses: dict[Future, int] = {}
+            pending = set(fetches)
+
+            # Wait on downloads and parses together, so a page is parsed as
+            # soon as it arrives and progress is reported as each URL is done
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in fetches:
+                        idx = fetches[future]
+                        html = future.result()
+                        if html is not None:
+                            parse = parser.submit(parse_html, html, urls[idx], self.strict_metadata)
+                            parses[parse] = idx
+                            pending.add(parse)
+                            continue
+                    else:
+                        results[parses[future]] = future.result()
+                    if on_progress:
+                        on_progress(1)
+
+        articles = [article for article in results if article]
         logger.info(f"Successfully extracted {len(articles)} out of {len(urls)} articles")
         return articles
 
     def close(self) -> None:
-        """Close the HTTP session."""
-        self.session.close()
+        """Close the HTTP session unless it was passed in."""
+        if self._owns_session:
+            self.session.close()
 
     def __enter__(self):
         """Context manager entry."""
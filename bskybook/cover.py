@@ -2,37 +2,133 @@
 
 import io
 import logging
-import math
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 import requests
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw, ImageFont, features
 
 from bskybook.content import Article
+from bskybook.utils import create_session, read_body
 
 logger = logging.getLogger(__name__)
 
+# Font candidates, tried in order before falling back to Pillow's default font
+_REGULAR_FONT_PATHS = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/System/Library/Fonts/Helvetica.ttc",
+)
+_BOLD_FONT_PATHS = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/System/Library/Fonts/Helvetica.ttc",
+)
+
+
+@lru_cache(maxsize=8)
+def _load_font(
+    size: int,
+    bold: bool = False
+) -> Union[ImageFont.FreeTypeFont, ImageFont.ImageFont]:
+    """Load the first available font for the given size.
+
+    The result is cached, so missing font paths are only probed once per
+    process and the parsed font is reused across covers.
+
+    Args:
+        size: Font size in pixels
+        bold: Whether to use a bold font
+
+    Returns:
+        A TrueType font if one is available, otherwise Pillow's default font
+    """
+    for path in (_BOLD_FONT_PATHS if bold else _REGULAR_FONT_PATHS):
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+
+@lru_cache(maxsize=16)
+def _line_height(font: Union[ImageFont.FreeTypeFont, ImageFont.ImageFont]) -> int:
+    """Get the height of a line of text in a font.
+
+    Args:
+        font: Font as returned by _load_font
+
+    Returns:
+        Ascent plus descent, in pixels
+    """
+    if hasattr(font, 'getmetrics'):
+        ascent, descent = font.getmetrics()
+        return ascent + descent
+    # Bitmap fonts have no metrics, measure a representative string
+    bbox = font.getbbox('Ag')
+    return bbox[3] - bbox[1]
+
+
+@lru_cache(maxsize=None)
+def _check_libjpeg_turbo() -> None:
+    """Warn once if Pillow was built without libjpeg-turbo."""
+    if not features.check_feature('libjpeg_turbo'):
+        logger.warning(
+            "Pillow is not using libjpeg-turbo; cover generation will be slower"
+        )
+
+
+# Black at alpha 180 over the title strip scales each channel by 75/255; as
+# a lookup table for Image.point, applied to R, G and B
+_OVERLAY_LUT = [(v * 75 + 127) // 255 for v in range(256)] * 3
+
 
 class CoverGenerator:
     """Generates cover images from article thumbnails."""
 
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
     # E-reader resolution
     COVER_WIDTH = 1264
     COVER_HEIGHT = 1680
 
-    def __init__(self, timeout: int = 30):
+    # Limit to 10 images for better visual appearance
+    MAX_IMAGES = 10
+
+    # Thumbnails larger than this are skipped to bound memory use
+    MAX_IMAGE_SIZE = 16 * 1024 * 1024
+
+    # Thumbnails are downloaded concurrently by this many threads
+    MAX_DOWNLOAD_WORKERS = 8
+
+    def __init__(
+        self,
+        timeout: int = 30,
+        use_cache: bool = False,
+        session: Optional[requests.Session] = None
+    ):
         """Initialize the cover generator.
 
         Args:
             timeout: Request timeout for downloading images
+            use_cache: Whether to cache downloaded thumbnails on disk
+                (ignored when a session is given)
+            session: Shared HTTP session to use instead of creating one.
+                It is left open by close().
         """
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        self._owns_session = session is None
+        if session is None:
+            session = create_session(self.USER_AGENT, use_cache=use_cache)
+        self.session = session
+        _check_libjpeg_turbo()
+        # Most recently used decoded thumbnails by URL and draft size, reused
+        # across covers; capped at MAX_IMAGES and shared by download threads
+        self._image_cache: OrderedDict[tuple[str, tuple[int, int]], Image.Image] = OrderedDict()
+        self._image_cache_lock = threading.Lock()
 
     @staticmethod
     def _get_ordinal_suffix(day: int) -> str:
@@ -66,7 +162,7 @@ class CoverGenerator:
         articles: list[Article],
         title: str = "BlueSky Book",
         output_path: Optional[Path] = None
-    ) -> bytes:
+    ) -> memoryview:
         """Generate a cover image from article thumbnails.
 
         Args:
@@ -75,25 +171,44 @@ class CoverGenerator:
             output_path: Optional path to save the cover image
 
         Returns:
-            Cover image as bytes (JPEG format)
+            Cover image (JPEG format) as a zero-copy view of the encoded bytes
         """
         logger.info(f"Generating cover from {len(articles)} articles")
 
-        # Download thumbnail images
-        thumbnail_urls = [a.thumbnail_url for a in articles if a.thumbnail_url]
-        images = self._download_images(thumbnail_urls)
-
-        if not images:
+        # Download thumbnail images and crop them to the mosaic cells they
+        # would fill if all downloads succeed. Articles from the same site
+        # often share a default image, so each URL is only used once.
+        thumbnail_urls = list(dict.fromkeys(
+            a.thumbnail_url for a in articles if a.thumbnail_url
+        ))[:self.MAX_IMAGES]
+        thumbnails = []
+        if thumbnail_urls:
+            _, _, cell_width, cell_height = self._grid_layout(len(thumbnail_urls))
+            thumbnails = self._download_images(thumbnail_urls, (cell_width, cell_height))
+
+        if not thumbnails:
             logger.warning("No thumbnail images available, creating simple cover")
             cover = self._create_simple_cover(title)
         else:
             # Create mosaic
-            cover = self._create_mosaic(images, title)
+            cover = self._create_mosaic(thumbnails, title)
 
         # Convert to bytes
         img_bytes = io.BytesIO()
-        cover.save(img_bytes, format='JPEG', quality=95)
-        img_data = img_bytes.getvalue()
+        # 4:2:0 chroma subsampling at quality 90 is indistinguishable on an
+        # e-reader and roughly halves the encoded size. Baseline (not
+        # progressive) JPEG is kept since some e-readers cannot show the
+        # latter. Huffman table optimization is skipped: it makes encoding
+        # several times slower to save well under a tenth of the size.
+        cover.save(
+            img_bytes,
+            format='JPEG',
+            quality=90,
+            subsampling=2,
+            optimize=False,
+            progressive=False
+        )
+        img_data = img_bytes.getbuffer()
 
         # Optionally save to file
         if output_path:
@@ -104,72 +219,147 @@ class CoverGenerator:
 
         return img_data
 
-    def _download_images(self, urls: list[str]) -> list[Image.Image]:
-        """Download images from URLs.
+    def _download_images(
+        self,
+        urls: list[str],
+        cell_size: tuple[int, int]
+    ) -> list[tuple[Image.Image, Image.Image]]:
+        """Download images from URLs concurrently and crop them to a cell.
+
+        Decoding, resizing and cropping happen in the download threads, as
+        Pillow releases the GIL while doing them.
 
         Args:
             urls: List of image URLs
+            cell_size: Size of the mosaic cell to crop each image to
 
         Returns:
-            List of PIL Image objects
+            List of (downloaded image, image cropped to cell_size) tuples,
+            in the order of the URLs
         """
-        images = []
+        urls = urls[:self.MAX_IMAGES]
+        if not urls:
+            return []
 
-        for url in urls[:10]:  # Limit to 10 images for better visual appearance
-            try:
-                logger.debug(f"Downloading image: {url}")
-                response = self.session.get(url, timeout=self.timeout)
-                response.raise_for_status()
+        workers = min(len(urls), self.MAX_DOWNLOAD_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(self._download_thumbnail, urls, [cell_size] * len(urls))
+            thumbnails = [thumb for thumb in results if thumb is not None]
 
-                img = Image.open(io.BytesIO(response.content))
-                # Convert to RGB if necessary
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                images.append(img)
+        logger.info(f"Successfully downloaded {len(thumbnails)} images")
+        return thumbnails
 
-            except Exception as e:
-                logger.debug(f"Failed to download image {url}: {e}")
-                continue
+    def _download_thumbnail(
+        self,
+        url: str,
+        cell_size: tuple[int, int]
+    ) -> Optional[tuple[Image.Image, Image.Image]]:
+        """Download a single image and crop it to fill a mosaic cell.
 
-        logger.info(f"Successfully downloaded {len(images)} images")
-        return images
+        Args:
+            url: Image URL
+            cell_size: Size of the mosaic cell
 
-    def _create_mosaic(self, images: list[Image.Image], title: str) -> Image.Image:
+        Returns:
+            Tuple of the downloaded image and its cropped version, or None if
+            the download failed
+        """
+        cell_width, cell_height = cell_size
+        # Decode at no less than twice the cell size
+        img = self._download_image(url, (cell_width * 2, cell_height * 2))
+        if img is None:
+            return None
+        return img, self._crop_to_fill(img, cell_width, cell_height)
+
+    def _download_image(self, url: str, draft_size: tuple[int, int]) -> Optional[Image.Image]:
+        """Download a single image.
+
+        JPEG images are decoded directly at a reduced scale (1/2, 1/4 or 1/8)
+        as long as the result is still at least draft_size, which skips most
+        of the decoding work for large thumbnails.
+
+        Args:
+            url: Image URL
+            draft_size: Smallest size the image needs to be decoded at
+
+        Returns:
+            PIL Image in RGB mode, or None if the download failed
+        """
+        key = (url, draft_size)
+        with self._image_cache_lock:
+            cached = self._image_cache.get(key)
+            if cached is not None:
+                self._image_cache.move_to_end(key)
+                return cached
+
+        try:
+            logger.debug(f"Downloading image: {url}")
+            with self.session.get(
+                url,
+                headers={'User-Agent': self.USER_AGENT},
+                timeout=self.timeout,
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                data, truncated = read_body(response, self.MAX_IMAGE_SIZE, self.session)
+            if truncated:
+                logger.debug(f"Skipping image over {self.MAX_IMAGE_SIZE} bytes: {url}")
+                return None
+
+            # Pillow needs a seekable file; BytesIO shares the bytes buffer
+            # instead of copying it
+            img = Image.open(io.BytesIO(data))
+            # Let the JPEG decoder downscale (no-op for other formats)
+            img.draft('RGB', draft_size)
+            # Convert to RGB if necessary
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            else:
+                # Decode now so the cached image no longer needs its source
+                img.load()
+            with self._image_cache_lock:
+                self._image_cache[key] = img
+                if len(self._image_cache) > self.MAX_IMAGES:
+                    self._image_cache.popitem(last=False)
+            return img
+
+        except Exception as e:
+            logger.debug(f"Failed to download image {url}: {e}")
+            return None
+
+    def _create_mosaic(
+        self,
+        thumbnails: list[tuple[Image.Image, Image.Image]],
+        title: str
+    ) -> Image.Image:
         """Create a mosaic layout from images.
 
         Uses a 2-column layout optimized for portrait covers with landscape images.
         Images are center-cropped to fill cells completely with no whitespace.
 
         Args:
-            images: List of PIL images (assumed to be landscape)
+            thumbnails: List of (image, cropped image) tuples as returned by
+                _download_images (images assumed to be landscape)
             title: Title to overlay on the cover
 
         Returns:
             Cover image
         """
-        # Use 2 columns for portrait orientation with landscape images
-        cols = 2
-        num_images = len(images)
-        rows = math.ceil(num_images / cols)
-
-        # Reserve space for title overlay at bottom
-        title_height = 200
-        available_height = self.COVER_HEIGHT - title_height
-
-        # Calculate cell dimensions
-        cell_width = self.COVER_WIDTH // cols
-        cell_height = available_height // rows
+        cols, _, cell_width, cell_height = self._grid_layout(len(thumbnails))
 
         # Create canvas
         canvas = Image.new('RGB', (self.COVER_WIDTH, self.COVER_HEIGHT), color='#1a1a1a')
 
         # Place images in grid
-        for idx, img in enumerate(images):
+        for idx, (img, img_cropped) in enumerate(thumbnails):
             row = idx // cols
             col = idx % cols
 
-            # Crop image to fill cell completely (no whitespace)
-            img_cropped = self._crop_to_fill(img, cell_width, cell_height)
+            # Images were cropped for the layout of all requested thumbnails;
+            # if some failed to download the cells are larger, so crop again
+            # to fill the cell completely (no whitespace)
+            if img_cropped.size != (cell_width, cell_height):
+                img_cropped = self._crop_to_fill(img, cell_width, cell_height)
 
             # Calculate position (images fill cells edge-to-edge)
             x = col * cell_width
@@ -182,6 +372,32 @@ class CoverGenerator:
 
         return canvas
 
+    def _grid_layout(self, num_images: int) -> tuple[int, int, int, int]:
+        """Compute the mosaic grid for a number of images.
+
+        Uses a 2-column layout optimized for portrait covers with landscape
+        images, leaving room for the title overlay at the bottom.
+
+        Args:
+            num_images: Number of images in the mosaic (at least 1)
+
+        Returns:
+            Tuple of (columns, rows, cell width, cell height)
+        """
+        # Use 2 columns for portrait orientation with landscape images
+        cols = 2
+        rows = -(-num_images // cols)
+
+        # Reserve space for title overlay at bottom
+        title_height = 200
+        available_height = self.COVER_HEIGHT - title_height
+
+        # Calculate cell dimensions
+        cell_width = self.COVER_WIDTH // cols
+        cell_height = available_height // rows
+
+        return cols, rows, cell_width, cell_height
+
     def _crop_to_fill(self, img: Image.Image, target_width: int, target_height: int) -> Image.Image:
         """Crop image to fill target dimensions completely (center crop).
 
@@ -196,97 +412,88 @@ class CoverGenerator:
         Returns:
             Cropped image that exactly fills target dimensions
         """
-        img_ratio = img.width / img.height
-        target_ratio = target_width / target_height
-
-        # Scale so the image covers the target (one dimension will be larger)
-        if img_ratio > target_ratio:
-            # Image is wider - scale by height, crop width
-            scale_height = target_height
-            scale_width = int(target_height * img_ratio)
+        # Pick the centered region of the source with the target's aspect
+        # ratio and resample only that region straight to the target size,
+        # so the cropped-away pixels are never scaled and the result is
+        # always exactly the cell size.
+        if img.width * target_height > target_width * img.height:
+            # Image is wider - keep full height, crop width
+            crop_width = img.height * target_width / target_height
+            left = (img.width - crop_width) / 2
+            box = (left, 0, left + crop_width, img.height)
+            scale = target_height / img.height
         else:
-            # Image is taller - scale by width, crop height
-            scale_width = target_width
-            scale_height = int(target_width / img_ratio)
-
-        # Resize image to cover target dimensions
-        img_scaled = img.resize((scale_width, scale_height), Image.Resampling.LANCZOS)
-
-        # Calculate crop box (center crop)
-        left = (scale_width - target_width) // 2
-        top = (scale_height - target_height) // 2
-        right = left + target_width
-        bottom = top + target_height
-
-        # Crop to exact target dimensions
-        return img_scaled.crop((left, top, right, bottom))
+            # Image is taller - keep full width, crop height
+            crop_height = img.width * target_height / target_width
+            top = (img.height - crop_height) / 2
+            box = (0, top, img.width, top + crop_height)
+            scale = target_width / img.width
+
+        # Bilinear is as sharp as Lanczos but much cheaper when the image is
+        # scaled to at least half its size, as with typical 1200x630 link
+        # card images. Larger sources use Lanczos, drafted JPEGs included:
+        # draft() keeps them at twice the cell size or more (see
+        # _download_thumbnail), so they are scaled to half or less here.
+        if scale < 0.5:
+            resample = Image.Resampling.LANCZOS
+        else:
+            resample = Image.Resampling.BILINEAR
+        return img.resize((target_width, target_height), resample, box=box)
 
     def _add_title_overlay(self, img: Image.Image, title: str) -> Image.Image:
         """Add a semi-transparent title overlay to the image.
 
+        Only the bottom strip is touched, in place, so the rest of the canvas
+        is never copied.
+
         Args:
-            img: PIL Image
+            img: PIL Image, modified in place
             title: Title text
 
         Returns:
-            Image with title overlay
+            The same image, with title overlay
         """
-        # Create a copy
-        overlay_img = img.copy()
-        overlay = Image.new('RGBA', img.size, (0, 0, 0, 0))
-        draw = ImageDraw.Draw(overlay)
-
-        # Draw semi-transparent rectangle at bottom
+        # The overlay only covers a strip at the bottom: darken that strip as
+        # a semi-transparent black rectangle would, then draw on it directly
         rect_height = 200
-        draw.rectangle(
-            [(0, img.height - rect_height), (img.width, img.height)],
-            fill=(0, 0, 0, 180)
-        )
+        strip_top = img.height - rect_height
+        strip = img.crop((0, strip_top, img.width, img.height)).point(_OVERLAY_LUT)
+        draw = ImageDraw.Draw(strip)
 
         # Try to use nice fonts, fall back to default
-        try:
-            title_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 60)
-            subtitle_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 24)
-        except:
-            try:
-                title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 60)
-                subtitle_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 24)
-            except:
-                title_font = ImageFont.load_default()
-                subtitle_font = ImageFont.load_default()
+        title_font = _load_font(60, bold=True)
+        subtitle_font = _load_font(24)
 
         # Get creation date subtitle
         creation_date = self._format_creation_date()
         subtitle = f"Created on {creation_date}, by bskybook"
 
-        # Get text bounding boxes for centering
-        title_bbox = draw.textbbox((0, 0), title, font=title_font)
-        title_width = title_bbox[2] - title_bbox[0]
-        title_height = title_bbox[3] - title_bbox[1]
+        # Measure text for centering
+        title_width = int(draw.textlength(title, font=title_font))
+        title_height = _line_height(title_font)
 
-        subtitle_bbox = draw.textbbox((0, 0), subtitle, font=subtitle_font)
-        subtitle_width = subtitle_bbox[2] - subtitle_bbox[0]
-        subtitle_height = subtitle_bbox[3] - subtitle_bbox[1]
+        subtitle_width = int(draw.textlength(subtitle, font=subtitle_font))
+        subtitle_height = _line_height(subtitle_font)
 
         # Calculate vertical spacing
         spacing = 10
         total_height = title_height + spacing + subtitle_height
-        start_y = img.height - rect_height // 2 - total_height // 2
+        start_y = rect_height // 2 - total_height // 2
 
         # Draw title text
         title_x = (img.width - title_width) // 2
         title_y = start_y
-        draw.text((title_x, title_y), title, fill=(255, 255, 255, 255), font=title_font)
+        draw.text((title_x, title_y), title, fill=(255, 255, 255), font=title_font)
 
         # Draw subtitle text
         subtitle_x = (img.width - subtitle_width) // 2
         subtitle_y = start_y + title_height + spacing
-        draw.text((subtitle_x, subtitle_y), subtitle, fill=(200, 200, 200, 255), font=subtitle_font)
+        draw.text((subtitle_x, subtitle_y), subtitle, fill=(200, 200, 200), font=subtitle_font)
 
-        # Composite overlay onto image
-        overlay_img.paste(Image.alpha_composite(overlay_img.convert('RGBA'), overlay).convert('RGB'))
+        # Put the finished strip back at the bottom of the image
+        img.paste(strip, (0, strip_top))
 
-        return overlay_img
+        return img
 
     def _create_simple_cover(self, title: str) -> Image.Image:
         """Create a simple text-based cover when no images are available.
@@ -300,30 +507,20 @@ class CoverGenerator:
         img = Image.new('RGB', (self.COVER_WIDTH, self.COVER_HEIGHT), color='#2C3E50')
         draw = ImageDraw.Draw(img)
 
-        # Try to use nice fonts
-        try:
-            title_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 80)
-            subtitle_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 30)
-        except:
-            try:
-                title_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 80)
-                subtitle_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 30)
-            except:
-                title_font = ImageFont.load_default()
-                subtitle_font = ImageFont.load_default()
+        # Try to use nice fonts, fall back to default
+        title_font = _load_font(80, bold=True)
+        subtitle_font = _load_font(30)
 
         # Get creation date subtitle
         creation_date = self._format_creation_date()
         subtitle = f"Created on {creation_date}, by bskybook"
 
-        # Get text bounding boxes
-        title_bbox = draw.textbbox((0, 0), title, font=title_font)
-        title_width = title_bbox[2] - title_bbox[0]
-        title_height = title_bbox[3] - title_bbox[1]
+        # Measure text
+        title_width = int(draw.textlength(title, font=title_font))
+        title_height = _line_height(title_font)
 
-        subtitle_bbox = draw.textbbox((0, 0), subtitle, font=subtitle_font)
-        subtitle_width = subtitle_bbox[2] - subtitle_bbox[0]
-        subtitle_height = subtitle_bbox[3] - subtitle_bbox[1]
+        subtitle_width = int(draw.textlength(subtitle, font=subtitle_font))
+        subtitle_height = _line_height(subtitle_font)
 
         # Calculate vertical spacing
         spacing = 20
@@ -343,8 +540,9 @@ class CoverGenerator:
         return img
 
     def close(self) -> None:
-        """Close the HTTP session."""
-        self.session.close()
+        """Close the HTTP session unless it was passed in."""
+        if self._owns_session:
+            self.session.close()
 
     def __enter__(self):
         """Context manager entry."""
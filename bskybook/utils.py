@@ -2,8 +2,28 @@
 
 import logging
 import re
+from datetime import timedelta
 from typing import Optional
-from urllib.parse import urlparse
+
+import requests
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Regular expression to match URLs: the scheme followed by a run of the
+# characters allowed in a URL (RFC 3986 unreserved and reserved characters,
+# plus % for percent-encoding)
+_URL_RE = re.compile(r"https?://[A-Za-z0-9\-._~:/?#\[\]@!$&'()*+,;=%]+")
+
+# Characters that are not allowed in filenames on common filesystems
+_INVALID_FN_RE = re.compile(r'[<>:"/\\|?*]')
+
+# Whether setup_logging has configured the root logger
+_LOG_CONFIGURED = False
+
+# Cached responses are purged this long after they were first stored, even
+# if they have been revalidated since
+_CACHE_RETENTION = timedelta(days=7)
 
 
 def setup_logging(verbose: bool = False) -> None:
@@ -12,11 +32,135 @@ def setup_logging(verbose: bool = False) -> None:
     Args:
         verbose: If True, set logging level to DEBUG, otherwise INFO
     """
+    global _LOG_CONFIGURED
+
     level = logging.DEBUG if verbose else logging.INFO
+    if _LOG_CONFIGURED:
+        # Only the level can change on later calls
+        logging.getLogger().setLevel(level)
+        return
+
     logging.basicConfig(
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         level=level
     )
+    _LOG_CONFIGURED = True
+
+
+def _is_cacheable(response: requests.Response) -> bool:
+    """Check whether the cache may store a response as it is received.
+
+    Streamed responses have not been read at that point, and storing them
+    would read the whole body regardless of the caller's size limit. They
+    are stored by read_body instead once their body has been read in full.
+
+    Args:
+        response: Response received from the server or read from the cache
+
+    Returns:
+        True unless the response is streamed
+    """
+    return isinstance(response, requests_cache.CachedResponse) or response._content_consumed
+
+
+def create_session(
+    user_agent: str,
+    use_cache: bool = False,
+    retry: Optional[Retry] = None,
+    prefix_retries: Optional[dict[str, Retry]] = None
+) -> requests.Session:
+    """Create an HTTP session with a large connection pool and retries.
+
+    The pool is sized for concurrent downloads so keep-alive connections are
+    reused rather than discarded, and transient errors are retried with
+    exponential backoff.
+
+    Args:
+        user_agent: User-Agent header sent with every request
+        use_cache: If True, cache GET responses for an hour in an SQLite
+            database in the user cache directory (e.g. ~/.cache/bskybook).
+            Expired responses are kept and revalidated with a conditional
+            request (If-None-Match / If-Modified-Since), so an unchanged
+            page or image is not downloaded again. Streamed responses are
+            only cached by read_body, and responses are purged a week after
+            they were stored.
+        retry: Retry policy for the session (default: 3 attempts with
+            exponential backoff on 429 and 5xx responses, ignoring
+            Retry-After so that a third-party host cannot stall a download
+            for as long as it asks)
+        prefix_retries: Retry policies replacing retry for URLs that start
+            with the given prefixes (e.g. an API's base URL)
+
+    Returns:
+        Configured requests session
+    """
+    if use_cache:
+        session = requests_cache.CachedSession(
+            'bskybook/http',
+            backend='sqlite',
+            use_cache_dir=True,
+            expire_after=3600,
+            allowable_methods=('GET',),
+            stale_if_error=True,
+            filter_fn=_is_cacheable
+        )
+        session.cache.delete(older_than=_CACHE_RETENTION)
+    else:
+        session = requests.Session()
+    session.headers.update({'User-Agent': user_agent})
+
+    if retry is None:
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=False
+        )
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    for prefix, prefix_retry in (prefix_retries or {}).items():
+        session.mount(prefix, HTTPAdapter(max_retries=prefix_retry))
+    return session
+
+
+def read_body(
+    response: requests.Response,
+    max_size: int,
+    session: Optional[requests.Session] = None
+) -> tuple[bytes, bool]:
+    """Read a streamed response body, stopping after max_size bytes.
+
+    Args:
+        response: Response of a request made with stream=True
+        max_size: Maximum number of bytes to keep
+        session: Session the request was made with; if it is a caching
+            session, a body read in full is stored in its cache
+
+    Returns:
+        The (possibly truncated) body and whether it was truncated
+    """
+    chunks = []
+    total = 0
+    for chunk in response.iter_content(chunk_size=65536):
+        chunks.append(chunk)
+        total += len(chunk)
+        if total > max_size:
+            return b''.join(chunks)[:max_size], True
+    body = b''.join(chunks)
+
+    if (
+        isinstance(session, requests_cache.CachedSession)
+        and not getattr(response, 'from_cache', False)
+        and response.status_code in session.settings.allowable_codes
+    ):
+        # The stream has been consumed, so hand the body to the cache directly
+        response._content = body
+        session.cache.save_response(
+            response,
+            expires=requests_cache.get_expiration_datetime(session.settings.expire_after)
+        )
+    return body, False
 
 
 def extract_handle_from_url(url: str) -> str:
@@ -38,11 +182,14 @@ def extract_handle_from_url(url: str) -> str:
     if not url.startswith(('http://', 'https://')):
         return url
 
-    # Parse URL and extract handle from path
-    parsed = urlparse(url)
-    if 'bsky.app' in parsed.netloc and '/profile/' in parsed.path:
-        handle = parsed.path.replace('/profile/', '').strip('/')
-        return handle
+    # Split off the host and take the path segment after /profile/
+    host, _, path = url.partition('://')[2].partition('/')
+    if (host == 'bsky.app' or host.endswith('.bsky.app')) and path.startswith('profile/'):
+        handle = path[len('profile/'):].partition('/')[0]
+        # Drop any query string or fragment
+        handle = handle.partition('?')[0].partition('#')[0]
+        if handle:
+            return handle
 
     # If we can't parse it, return as-is and let the API handle it
     return url
@@ -57,11 +204,11 @@ def extract_links(text: str) -> list[str]:
     Returns:
         List of URLs found in the text
     """
-    # Regular expression to match URLs
-    url_pattern = re.compile(
-        r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-    )
-    return url_pattern.findall(text)
+    # Most texts scanned here have no links at all; a substring search
+    # rejects those about twice as fast as running the regex
+    if 'http' not in text:
+        return []
+    return _URL_RE.findall(text)
 
 
 def sanitize_filename(filename: str) -> str:
@@ -74,11 +221,9 @@ def sanitize_filename(filename: str) -> str:
         A safe filename
     """
     # Remove or replace invalid characters
-    filename = re.sub(r'[<>:"/\\|?*]', '_', filename)
+    filename = _INVALID_FN_RE.sub('_', filename)
     # Limit length
-    if len(filename) > 200:
-        filename = filename[:200]
-    return filename
+    return filename[:200]
 
 
 def truncate_text(text: str, max_length: int = 100) -> str:
@@ -91,6 +236,4 @@ def truncate_text(text: str, max_length: int = 100) -> str:
     Returns:
         Truncated text
     """
-    if len(text) <= max_length:
-        return text
-    return text[:max_length - 3] + '...'
+    return text if len(text) <= max_length else text[:max_length - 3] + '...'